@@ -4,8 +4,13 @@ Allows agent logic to be pure Python without Streamlit dependency
 """
 
 
-class AgentContractError(Exception):
-    """Raised when agent violates JSON response contract"""
+class AgentContractError(RuntimeError):
+    """Raised when agent violates JSON response contract (a RuntimeError, per AGENT_CONTRACT.md)"""
+    pass
+
+
+class AgentTruncationError(AgentContractError):
+    """Raised when the reply was cut off at the output-token limit (a retry would be cut off again)"""
     pass
 
 
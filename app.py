@@ -1,11 +1,16 @@
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import streamlit as st
-from pdf_utils import fill_application_pdf
 import eligibility_checker
-from conversation_agent import init_agent
-from application_schema import FIELD_PAGES, REQUIRED_FIELDS, ApplicationSchema
+from llm_cache import ResponseCache
+from agent_exceptions import AgentTruncationError
+from application_schema import FIELD_ORDER, FIELD_PAGES, ApplicationSchema
 import re
 
+logger = logging.getLogger(__name__)
+
 # ============================================================
 # Paths
 # ============================================================
@@ -14,18 +19,66 @@ PDF_DIR = os.path.join(BASE_DIR, "pdf")
 PDF_TEMPLATE_PATH = os.path.join(
     PDF_DIR, "Innovation_Voucher_ApplicationForm.pdf"
 )
-OUTPUT_PDF_PATH = os.path.join(
-    BASE_DIR, "Completed_Innovation_Voucher_Application.pdf"
+LLM_CACHE_DIR = os.path.join(BASE_DIR, ".llm_cache")
+
+HEADER_MARKDOWN = """
+# Innovation Voucher Application
+<p style="color: rgba(49, 51, 63, 0.6); font-size: 14px; margin-top: -0.5rem;">Enterprise Ireland</p>
+
+---
+
+### Step 1: Eligibility Check
+"""
+
+TOTAL_PAGES = len(FIELD_PAGES)
+
+# First page of each section (page id prefix), found in one pass for the review edit buttons
+SECTION_FIRST_PAGE = {}
+for _index, _page in enumerate(FIELD_PAGES):
+    SECTION_FIRST_PAGE.setdefault(_page["id"].split("_", 1)[0], _index)
+
+# Review cards: (label, form_data path, display format, default when missing)
+COMPANY_SUMMARY_FIELDS = (
+    ("Legal name", "company.legal_name", "{}", "_Not provided_"),
+    ("CRO number", "company.cro_number", "{}", "_Not provided_"),
+    ("Address", "company.registered_address.city", "{}", "_Not provided_"),
+    ("Employees", "company.employees.full_time", "{} FT", 0),
+)
+CONTACT_SUMMARY_FIELDS = (
+    ("Name", "contacts.primary.name", "{}", "_Not provided_"),
+    ("Email", "contacts.primary.email", "{}", "_Not provided_"),
+)
+# Project card: (label, form_data path), shown only when answered
+PROJECT_SUMMARY_FIELDS = (
+    ("Challenge", "project.challenge"),
+    ("Innovation", "project.description"),
+    ("Commercial impact", "project.commercial_impact"),
 )
 
-PDF_FIELD_MAP = {
-    "innovative_product":   {"page": 3, "x": 40, "y": 520},
-    "primary_issues":       {"page": 3, "x": 40, "y": 420},
-    "skills_expertise":     {"page": 3, "x": 40, "y": 320},
-    "expected_deliverables":{"page": 3, "x": 40, "y": 220},
-    "company_benefit":      {"page": 3, "x": 40, "y": 120},
+# Per-field format checks: path -> (predicate, error message); patterns compiled once
+EMAIL_RE = re.compile(r"[^@]+@[^@]+\.[^@]+")
+FIELD_VALIDATORS = {
+    "contacts.primary.email": (EMAIL_RE.match, "Please enter a valid email address"),
+    "company.cro_number": (lambda v: v.isdigit() and len(v) >= 5, "CRO number should be at least 5 digits"),
 }
 
+# Expert evaluation headline marker per overall rating
+RATING_EMOJI = {"Low": "🔴", "Medium": "🟡", "High": "🟢"}
+
+# Generic terms that flag a short answer as vague
+BUZZWORDS = ("synergy", "innovative", "disrupt", "revolutionize", "transform")
+# One case-insensitive pass over the text (substring match, like the original check)
+BUZZWORD_RE = re.compile("|".join(map(re.escape, BUZZWORDS)), re.IGNORECASE)
+
+# (PDF field, page, x, y): the renderer only ever walks these in order
+PDF_FIELD_MAP = (
+    ("innovative_product",    3, 40, 520),
+    ("primary_issues",        3, 40, 420),
+    ("skills_expertise",      3, 40, 320),
+    ("expected_deliverables", 3, 40, 220),
+    ("company_benefit",       3, 40, 120),
+)
+
 # ============================================================
 # Page Config
 # ============================================================
@@ -36,7 +89,7 @@ st.set_page_config(
 )
 
 # Enhanced CSS for modern, trustworthy UI
-st.markdown("""
+PAGE_CSS = """
 <style>
     .main {
         background-color: #F8F9FA;
@@ -113,25 +166,6 @@ st.markdown("""
         height: 6px;
     }
 
-    with st.sidebar:
-    st.markdown("### Settings")
-    api_key = None
-    if "OPENAI_API_KEY" not in os.environ:
-        api_key = st.text_input("OpenAI API Key", type="password")
-    
-    if st.button("💾 Save Draft"):
-        import json
-        with open("draft.json", "w") as f:
-            json.dump({"page": st.session_state.current_page_index, 
-                      "data": st.session_state.form_data}, f)
-    
-    if st.button("📂 Load Draft"):
-        import json
-        with open("draft.json") as f:
-            d = json.load(f)
-            st.session_state.current_page_index = d["page"]
-            st.session_state.form_data = d["data"]
-    
     /* Remove padding */
     .block-container {
         padding-top: 2.5rem;
@@ -157,7 +191,10 @@ st.markdown("""
         margin: 16px 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+# Sent on every rerun: strip comments and whitespace once at import
+PAGE_CSS = re.sub(r"\s*([{};])\s*", r"\1", re.sub(r"/\*.*?\*/|\s+", " ", PAGE_CSS, flags=re.S)).strip()
+st.markdown(PAGE_CSS, unsafe_allow_html=True)
 
 # ============================================================
 # Safety Check
@@ -182,137 +219,115 @@ if "page_completed" not in st.session_state:
 # Helper Functions
 # ============================================================
 
-def validate_field(field_config, value):
-    """Validate field value"""
-    if field_config["required"] and not value:
-        return False, f"{field_config['label']} is required"
-    
-    # Email validation
-    if field_config["path"] == "contacts.primary.email" and value:
-        if not re.match(r"[^@]+@[^@]+\.[^@]+", value):
-            return False, "Please enter a valid email address"
-    
-    # CRO number validation
-    if field_config["path"] == "company.cro_number" and value:
-        if not (value.isdigit() and len(value) >= 5):
-            return False, "CRO number should be at least 5 digits"
-    
-    return True, None
-
+@st.cache_resource
+def get_openai_client():
+    """One OpenAI client (and HTTP connection pool) for the whole process"""
+    # Imported on first use: openai is the slowest import and eligibility doesn't need it
+    import httpx
+    from openai import DefaultHttpxClient, OpenAI
+    
+    # HTTP/2 multiplexes concurrent sessions over one TLS connection
+    http_client = DefaultHttpxClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+    )
+    # Transient 429/5xx/connect errors are retried by the SDK with exponential backoff;
+    # a short connect timeout fails over to a retry instead of hanging the turn
+    return OpenAI(
+        http_client=http_client,
+        timeout=httpx.Timeout(60.0, connect=5.0),
+        max_retries=4,
+    )
 
-def assess_answer_quality(text):
-    """Real-time quality assessment"""
-    if not text or len(text.strip()) < 10:
-        return "brief", "This answer is quite brief. Consider adding more detail."
-    
-    if len(text.strip().split()) < 15:
-        return "short", "This could be stronger with more specific information."
-    
-    # Check for buzzwords without substance
-    buzzwords = ["synergy", "innovative", "disrupt", "revolutionize", "transform"]
-    if any(word in text.lower() for word in buzzwords) and len(text.split()) < 30:
-        return "vague", "Try to be more specific about outcomes and methods rather than using general terms."
-    
-    return "good", None
 
+@st.cache_resource
+def get_response_cache():
+    """One on-disk LLM response cache shared by every session"""
+    return ResponseCache(LLM_CACHE_DIR)
 
-# ============================================================
-# PHASE 1: ELIGIBILITY
-# ============================================================
-st.title("Innovation Voucher Application")
-st.caption("Enterprise Ireland")
-st.markdown("---")
 
-st.subheader("Step 1: Eligibility Check")
+@st.cache_resource
+def get_pdf_executor():
+    """Background workers for PDF rendering, shared by every session"""
+    return ThreadPoolExecutor(max_workers=2)
 
-eligibility_result = eligibility_checker.check_eligibility()
 
-if eligibility_result is False:
-    st.stop()
+def get_pdf_future(form_data):
+    """Start rendering the PDF for the current answers, reusing a job already in flight"""
+    from pdf_utils import fill_application_pdf
+    
+    # Map form_data to PDF format
+    pdf_data = {
+        "innovative_product": form_data.get("project.description", ""),
+        "primary_issues": form_data.get("project.challenge", ""),
+        "skills_expertise": form_data.get("project.skills_required", ""),
+        "expected_deliverables": form_data.get("project.deliverables", ""),
+        "company_benefit": form_data.get("project.commercial_impact", ""),
+    }
+    job_key = tuple(pdf_data.items())
+    
+    job = st.session_state.get("pdf_job")
+    if job is None or job[0] != job_key:
+        future = get_pdf_executor().submit(
+            fill_application_pdf,
+            template_path=PDF_TEMPLATE_PATH,
+            output_path=None,
+            answers=pdf_data,
+            field_map=PDF_FIELD_MAP,
+        )
+        job = (job_key, future)
+        st.session_state.pdf_job = job
+    return job[1]
 
-if eligibility_result is None:
-    st.stop()
 
-st.success("✓ You're eligible to apply")
-eligibility_checker.show_eligibility_summary()
+def init_agent():
+    """Initialize agent in session state"""
+    if "agent" not in st.session_state:
+        from conversation_agent import ConversationAgent
+        
+        st.session_state.agent = ConversationAgent(
+            cache=get_response_cache(),
+            client=get_openai_client(),
+        )
+    return st.session_state.agent
 
-st.markdown("---")
 
-# ============================================================
-# PHASE 2: APPLICATION (PAGE-BASED)
-# ============================================================
-
-st.subheader("Step 2: Application")
+def validate_field(field_config, value):
+    """Validate field value"""
+    if field_config["required"] and not value:
+        return False, f"{field_config['label']} is required"
+    
+    # Format checks (email, CRO number): one dict lookup instead of an if-ladder
+    validator = FIELD_VALIDATORS.get(field_config["path"])
+    if validator and value:
+        check, error_msg = validator
+        if not check(value):
+            return False, error_msg
+    
+    return True, None
 
-# Progress indicator
-total_pages = len(FIELD_PAGES)
-current_page_index = st.session_state.current_page_index
-progress = (current_page_index / total_pages) * 100
 
-st.progress(progress / 100)
-st.caption(f"Page {current_page_index + 1} of {total_pages} • ~{(total_pages - current_page_index) * 2} minutes remaining")
+def summary_markdown(form_data, fields):
+    """Render a review card's fields as one markdown block"""
+    return "\n\n".join(
+        f"**{label}:** " + fmt.format(form_data.get(path, default))
+        for label, path, fmt, default in fields
+    )
 
-st.markdown("")
 
-# Get current page
-if current_page_index >= len(FIELD_PAGES):
-    # REVIEW MODE
-    st.markdown("### Step 3: Review Your Application")
-    
-    st.info("Review your application below. Click any section to edit.")
-    
-    # Group by section
-    company_fields = [p for p in FIELD_PAGES if p["id"].startswith("company")]
-    contact_fields = [p for p in FIELD_PAGES if p["id"].startswith("contact")]
-    project_fields = [p for p in FIELD_PAGES if p["id"].startswith("project")]
-    
-    # Company card
-    with st.expander("✓ Company Information", expanded=False):
-        st.markdown("**Legal name:** " + st.session_state.form_data.get("company.legal_name", "_Not provided_"))
-        st.markdown("**CRO number:** " + str(st.session_state.form_data.get("company.cro_number", "_Not provided_")))
-        st.markdown("**Address:** " + st.session_state.form_data.get("company.registered_address.city", "_Not provided_"))
-        st.markdown("**Employees:** " + str(st.session_state.form_data.get("company.employees.full_time", 0)) + " FT")
-        
-        if st.button("Edit company information", key="edit_company"):
-            st.session_state.current_page_index = 0
-            st.rerun()
-    
-    # Contact card
-    with st.expander("✓ Contact Information", expanded=False):
-        st.markdown("**Name:** " + st.session_state.form_data.get("contacts.primary.name", "_Not provided_"))
-        st.markdown("**Email:** " + st.session_state.form_data.get("contacts.primary.email", "_Not provided_"))
+def render_summary_card(section, fields, form_data):
+    """Collapsed review card: one markdown block plus an edit button back to the section"""
+    with st.expander(f"✓ {section} Information", expanded=False):
+        st.markdown(summary_markdown(form_data, fields))
         
-        if st.button("Edit contact information", key="edit_contact"):
-            st.session_state.current_page_index = 3
+        if st.button(f"Edit {section.lower()} information", key=f"edit_{section.lower()}"):
+            st.session_state.current_page_index = SECTION_FIRST_PAGE[section.lower()]
             st.rerun()
-    
-    # Project card with quality indicators
-    with st.expander("Project Details", expanded=True):
-        challenge = st.session_state.form_data.get("project.challenge", "")
-        if challenge:
-            st.markdown("**Challenge:**")
-            st.write(challenge)
-            quality, _ = assess_answer_quality(challenge)
-            if quality != "good":
-                st.warning("💡 Consider strengthening this answer with more specific details")
-        
-        description = st.session_state.form_data.get("project.description", "")
-        if description:
-            st.markdown("**Innovation:**")
-            st.write(description)
-        
-        impact = st.session_state.form_data.get("project.commercial_impact", "")
-        if impact:
-            st.markdown("**Commercial impact:**")
-            st.write(impact)
-        
-        if st.button("Edit project details", key="edit_project"):
-            st.session_state.current_page_index = 4
-            st.rerun()
-    
-    st.markdown("---")
-    
-    # EVALUATOR MODE - Expert Assessment
+
+
+@st.fragment
+def render_expert_evaluation():
+    """Expert assessment section; runs as a fragment so its button doesn't rerun the whole app"""
     st.subheader("Expert Evaluation")
     
     if st.button("Get Expert Assessment", type="secondary", use_container_width=True):
@@ -327,7 +342,6 @@ if current_page_index >= len(FIELD_PAGES):
             skipped_fields = []     # Would come from agent state
             
             # Get schema from form_data
-            from application_schema import ApplicationSchema
             schema = ApplicationSchema()
             
             # Populate schema from form_data
@@ -341,8 +355,7 @@ if current_page_index >= len(FIELD_PAGES):
         st.markdown("---")
         
         # Overall Assessment
-        rating_emoji = {"Low": "🔴", "Medium": "🟡", "High": "🟢"}
-        st.markdown(f"### {rating_emoji.get(evaluation.overall_rating, '')} Overall Assessment: {evaluation.overall_rating}")
+        st.markdown(f"### {RATING_EMOJI.get(evaluation.overall_rating, '')} Overall Assessment: {evaluation.overall_rating}")
         st.info(evaluation.overall_rationale)
         
         # Strengths
@@ -371,43 +384,123 @@ if current_page_index >= len(FIELD_PAGES):
                     st.write(f"{i}. {suggestion}")
         
         st.markdown("---")
+
+
+@lru_cache(maxsize=512)
+def assess_answer_quality(text):
+    """Real-time quality assessment (pure, so memoised across reruns)"""
+    if not text or len(text.strip()) < 10:
+        return "brief", "This answer is quite brief. Consider adding more detail."
+    
+    # Runs on every rerun: split once and reuse the count
+    word_count = len(text.split())
+    if word_count < 15:
+        return "short", "This could be stronger with more specific information."
+    
+    # Check for buzzwords without substance
+    if word_count < 30 and BUZZWORD_RE.search(text):
+        return "vague", "Try to be more specific about outcomes and methods rather than using general terms."
+    
+    return "good", None
+
+
+# ============================================================
+# PHASE 1: ELIGIBILITY
+# ============================================================
+# Static header sent as one element per rerun instead of four
+st.markdown(HEADER_MARKDOWN, unsafe_allow_html=True)
+
+eligibility_result = eligibility_checker.check_eligibility()
+
+if eligibility_result is False:
+    st.stop()
+
+if eligibility_result is None:
+    st.stop()
+
+st.success("✓ You're eligible to apply")
+eligibility_checker.show_eligibility_summary()
+
+st.markdown("---")
+
+# ============================================================
+# PHASE 2: APPLICATION (PAGE-BASED)
+# ============================================================
+
+st.subheader("Step 2: Application")
+
+# Progress indicator
+current_page_index = st.session_state.current_page_index
+# Bind once: each st.session_state access goes through the session-state proxy
+form_data = st.session_state.form_data
+
+st.progress(current_page_index / TOTAL_PAGES)
+st.caption(f"Page {current_page_index + 1} of {TOTAL_PAGES} • ~{(TOTAL_PAGES - current_page_index) * 2} minutes remaining")
+
+st.markdown("")
+
+# Get current page
+if current_page_index >= TOTAL_PAGES:
+    # REVIEW MODE
+    st.markdown("### Step 3: Review Your Application")
+    
+    st.info("Review your application below. Click any section to edit.")
+    
+    # Render the PDF in the background while the user reads the review
+    pdf_future = get_pdf_future(form_data)
+    
+    # Company and contact cards
+    render_summary_card("Company", COMPANY_SUMMARY_FIELDS, form_data)
+    render_summary_card("Contact", CONTACT_SUMMARY_FIELDS, form_data)
+    
+    # Project card with quality indicators
+    with st.expander("Project Details", expanded=True):
+        for label, path in PROJECT_SUMMARY_FIELDS:
+            value = form_data.get(path, "")
+            if not value:
+                continue
+            # One element per field; st.write on a str renders the same markdown
+            st.markdown(f"**{label}:**\n\n{value}")
+            if path == "project.challenge":
+                quality, _ = assess_answer_quality(value)
+                if quality != "good":
+                    st.warning("💡 Consider strengthening this answer with more specific details")
+        
+        if st.button("Edit project details", key="edit_project"):
+            st.session_state.current_page_index = SECTION_FIRST_PAGE["project"]
+            st.rerun()
+    
+    st.markdown("---")
+    
+    # EVALUATOR MODE - Expert Assessment (fragment: the button reruns only this section)
+    render_expert_evaluation()
     
     col1, col2 = st.columns([1, 2])
     
     with col1:
         if st.button("← Back to edit", use_container_width=True):
-            st.session_state.current_page_index = len(FIELD_PAGES) - 1
+            st.session_state.current_page_index = TOTAL_PAGES - 1
             st.rerun()
     
     with col2:
         if st.button("Generate PDF Application", type="primary", use_container_width=True):
+            st.session_state.pdf_requested = True
+        
+        # Keep the download on later reruns; bytes stay in memory on the session's PDF job
+        if st.session_state.get("pdf_requested"):
+            # Usually already rendered: the job starts as soon as review mode opens
             with st.spinner("Generating..."):
-                # Map form_data to PDF format
-                pdf_data = {
-                    "innovative_product": st.session_state.form_data.get("project.description", ""),
-                    "primary_issues": st.session_state.form_data.get("project.challenge", ""),
-                    "skills_expertise": st.session_state.form_data.get("project.skills_required", ""),
-                    "expected_deliverables": st.session_state.form_data.get("project.deliverables", ""),
-                    "company_benefit": st.session_state.form_data.get("project.commercial_impact", ""),
-                }
-                
-                fill_application_pdf(
-                    template_path=PDF_TEMPLATE_PATH,
-                    output_path=OUTPUT_PDF_PATH,
-                    answers=pdf_data,
-                    field_map=PDF_FIELD_MAP,
-                )
+                pdf_bytes = pdf_future.result()
             
             st.success("✓ Application ready")
             
-            with open(OUTPUT_PDF_PATH, "rb") as f:
-                st.download_button(
-                    label="Download Application PDF",
-                    data=f,
-                    file_name="Innovation_Voucher_Application.pdf",
-                    mime="application/pdf",
-                    use_container_width=True
-                )
+            st.download_button(
+                label="Download Application PDF",
+                data=pdf_bytes,
+                file_name="Innovation_Voucher_Application.pdf",
+                mime="application/pdf",
+                use_container_width=True
+            )
 else:
     # CURRENT PAGE
     current_page = FIELD_PAGES[current_page_index]
@@ -420,66 +513,76 @@ else:
     
     if current_page["type"] == "form":
         # MULTI-FIELD FORM PAGE
+        # Inputs live in a form so the script reruns once on submit, not per widget edit
         page_data = {}
-        page_valid = True
         
-        for field_config in current_page["fields"]:
-            field_path = field_config["path"]
+        with st.form(f"form_{current_page['id']}"):
+            for field_config in current_page["fields"]:
+                field_path = field_config["path"]
+                
+                # Get existing value
+                existing_value = form_data.get(field_path, "")
+                
+                # Show input
+                if field_config["type"] == "text":
+                    value = st.text_input(
+                        field_config["label"],
+                        value=existing_value,
+                        help=field_config.get("help"),
+                        key=f"input_{field_path}"
+                    )
+                elif field_config["type"] == "textarea":
+                    value = st.text_area(
+                        field_config["label"],
+                        value=existing_value,
+                        help=field_config.get("help"),
+                        height=100,
+                        key=f"input_{field_path}"
+                    )
+                elif field_config["type"] == "number":
+                    value = st.number_input(
+                        field_config["label"],
+                        value=int(existing_value) if existing_value else 0,
+                        min_value=0,
+                        step=1,
+                        key=f"input_{field_path}"
+                    )
+                else:
+                    value = existing_value
+                
+                page_data[field_path] = value
             
-            # Get existing value
-            existing_value = st.session_state.form_data.get(field_path, "")
+            st.markdown("")
             
-            # Show input
-            if field_config["type"] == "text":
-                value = st.text_input(
-                    field_config["label"],
-                    value=existing_value,
-                    help=field_config.get("help"),
-                    key=f"input_{field_path}"
-                )
-            elif field_config["type"] == "textarea":
-                value = st.text_area(
-                    field_config["label"],
-                    value=existing_value,
-                    help=field_config.get("help"),
-                    height=100,
-                    key=f"input_{field_path}"
-                )
-            elif field_config["type"] == "number":
-                value = st.number_input(
-                    field_config["label"],
-                    value=int(existing_value) if existing_value else 0,
-                    min_value=0,
-                    step=1,
-                    key=f"input_{field_path}"
-                )
-            else:
-                value = existing_value
+            # Navigation
+            col1, col2 = st.columns([1, 2])
             
-            page_data[field_path] = value
+            with col1:
+                previous = st.form_submit_button(
+                    "← Previous", use_container_width=True, disabled=current_page_index == 0
+                )
             
-            # Validate
-            is_valid, error_msg = validate_field(field_config, value)
-            if not is_valid:
-                page_valid = False
-                if value:  # Only show error if user has entered something
-                    st.error(error_msg)
-        
-        st.markdown("")
-        
-        # Navigation
-        col1, col2 = st.columns([1, 2])
+            with col2:
+                submitted = st.form_submit_button("Continue →", type="primary", use_container_width=True)
         
-        with col1:
-            if current_page_index > 0:
-                if st.button("← Previous", use_container_width=True):
-                    st.session_state.current_page_index -= 1
-                    st.rerun()
+        if previous:
+            st.session_state.current_page_index -= 1
+            st.rerun()
         
-        with col2:
-            if st.button("Continue →", type="primary", use_container_width=True, disabled=not page_valid):
+        if submitted:
+            # Validate only on submit; values are batched until then
+            errors = []
+            for field_config in current_page["fields"]:
+                is_valid, error_msg = validate_field(field_config, page_data[field_config["path"]])
+                if not is_valid:
+                    errors.append(error_msg)
+            
+            if errors:
+                for error_msg in errors:
+                    st.error(error_msg)
+            else:
                 # Save data
-                st.session_state.form_data.update(page_data)
+                form_data.update(page_data)
                 st.session_state.page_completed.add(current_page["id"])
                 st.session_state.current_page_index += 1
                 st.rerun()
@@ -490,9 +593,11 @@ else:
         field_path = current_page["field"]
         
         # Check if we have pending confirmation
-        if agent.state.pending_confirmation:
+        state = agent.state
+        pending = state.pending_confirmation
+        
+        if pending:
             # CONFIRMATION STEP
-            pending = agent.state.pending_confirmation
             
             st.markdown('<div class="confirmation-box">', unsafe_allow_html=True)
             st.markdown("**What I understood:**")
@@ -511,19 +616,19 @@ else:
                 if st.button("✓ Yes, continue", type="primary", use_container_width=True):
                     # Apply data
                     for path, value in pending["data"].items():
-                        st.session_state.form_data[path] = value
-                    agent.state.confirm_pending()
+                        form_data[path] = value
+                    state.confirm_pending()
                     st.session_state.current_page_index += 1
                     st.rerun()
             
             with col2:
                 if st.button("Let me edit", use_container_width=True):
-                    agent.state.reject_pending()
+                    state.reject_pending()
                     st.rerun()
         
         else:
             # QUESTION INPUT
-            existing_answer = st.session_state.form_data.get(field_path, "")
+            existing_answer = form_data.get(field_path, "")
             
             user_input = st.text_area(
                 "Your answer",
@@ -552,18 +657,38 @@ else:
             with col2:
                 if st.button("Continue →", type="primary", use_container_width=True, disabled=not user_input):
                     try:
-                        # Process with AI
+                        # Process with AI, streaming the summary as it is written
+                        preview = st.empty()
+                        shown = {"summary": ""}
+                        
+                        def show_partial(partial):
+                            # Most deltas land in other keys; only push a frame when the summary grew
+                            summary = partial.get("summary_for_user")
+                            if summary and summary != shown["summary"]:
+                                shown["summary"] = summary
+                                preview.markdown(f"**What I understood:** {summary}")
+                        
+                        # Pages drive navigation here, so point the agent at this page's field explicitly
+                        state.current_field_index = FIELD_ORDER.index(field_path)
+                        
                         with st.spinner("Processing..."):
-                            result = agent.process_input(user_input)
+                            result = agent.process_input(user_input, on_partial=show_partial)
                         
                         # Set pending confirmation
                         if result.get("extracted_data"):
-                            agent.state.set_pending_confirmation(
+                            state.set_pending_confirmation(
                                 result["extracted_data"],
                                 result["summary_for_user"],
                                 result["confidence"]
                             )
                             st.rerun()
                     
-                    except Exception as e:
-                        st.error(f"Error: {str(e)}")
+                    except AgentTruncationError:
+                        # Retrying the same answer would be cut off again: ask for a shorter one
+                        logger.warning("Agent reply truncated for %s (%d chars of input)", field_path, len(user_input))
+                        st.error("That answer is too long to process in one go. Please shorten it and try again.")
+                    
+                    except Exception:
+                        # Full traceback goes to the server log; the user gets a retryable message
+                        logger.exception("process_input failed for %s", field_path)
+                        st.error("Something went wrong processing your answer. Please try again.")
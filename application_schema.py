@@ -2,11 +2,19 @@
 Enhanced application schema with page grouping for better UX
 """
 
-from typing import Optional, List, Dict, Any
-from dataclasses import dataclass, field, asdict
+from copy import deepcopy
+from typing import Optional, List, Dict, Any, Tuple
+from dataclasses import dataclass, field, asdict, is_dataclass
+from operator import attrgetter
 
+import orjson
 
-@dataclass
+
+# getattr default for path walks: absence is a normal outcome, not worth a hasattr probe
+_MISSING = object()
+
+
+@dataclass(slots=True)
 class Address:
     line1: Optional[str] = None
     line2: Optional[str] = None
@@ -16,13 +24,13 @@ class Address:
     country: str = "Ireland"
 
 
-@dataclass
+@dataclass(slots=True)
 class Employees:
     full_time: Optional[int] = None
     part_time: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Company:
     legal_name: Optional[str] = None
     trading_name: Optional[str] = None
@@ -35,7 +43,7 @@ class Company:
     employees: Employees = field(default_factory=Employees)
 
 
-@dataclass
+@dataclass(slots=True)
 class Contact:
     name: Optional[str] = None
     title: Optional[str] = None
@@ -43,12 +51,12 @@ class Contact:
     phone: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Contacts:
     primary: Contact = field(default_factory=Contact)
 
 
-@dataclass
+@dataclass(slots=True)
 class Project:
     title: Optional[str] = None
     challenge: Optional[str] = None
@@ -61,41 +69,117 @@ class Project:
     timeline: Optional[str] = None
 
 
+# Not slotted: __post_init__ hangs the to_dict()/to_json() mirror off the instance
 @dataclass
 class ApplicationSchema:
     company: Company = field(default_factory=Company)
     contacts: Contacts = field(default_factory=Contacts)
     project: Project = field(default_factory=Project)
 
+    def __post_init__(self):
+        # Plain-dict mirror of the tree, built once and kept in step by set_field,
+        # so the per-turn to_dict() doesn't re-run asdict's recursive copy
+        self._dict = asdict(self)
+        self._json: Optional[str] = None
+        self._section_json: Dict[str, str] = {}
+
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        """The schema as plain nested dicts; a fresh copy each call, safe to mutate"""
+        # Decoded from the cached JSON (C-level), so callers never hold the mirror itself
+        return orjson.loads(self.to_json())
+
+    def to_json(self) -> str:
+        """Compact JSON of to_dict(), re-serialised only after a set_field"""
+        if self._json is None:
+            self._json = orjson.dumps(self._dict).decode()
+        return self._json
+
+    def section_json(self, section: str) -> str:
+        """Compact JSON {path: value} of the filled fields in one section, cached until the next write"""
+        cached = self._section_json.get(section)
+        if cached is None:
+            filled = {}
+            for path in SECTION_FIELDS.get(section, ()):
+                value = self.get_field(path)
+                if value not in (None, "", []):
+                    filled[path] = value
+            cached = self._section_json[section] = orjson.dumps(filled).decode()
+        return cached
+
+    def _invalidate_json(self):
+        self._json = None
+        self._section_json.clear()
 
     def get_field(self, path: str) -> Any:
-        parts = path.split('.')
+        resolver = _PATH_RESOLVERS.get(path)
+        if resolver is not None:
+            parent_of, _, attr = resolver
+            try:
+                return getattr(parent_of(self), attr)
+            except AttributeError:
+                pass  # A parent was overwritten with a plain value (e.g. an address string)
+        
+        # Paths outside FIELD_ORDER (e.g. "company"), or whose parent is no longer a
+        # dataclass, fall back to the walk: a missing step means None, never an error
         obj = self
-        for part in parts:
-            if hasattr(obj, part):
-                obj = getattr(obj, part)
-            else:
+        for part in path.split('.'):
+            obj = getattr(obj, part, _MISSING)
+            if obj is _MISSING:
                 return None
         return obj
 
+    def _write(self, resolver: tuple, value: Any) -> bool:
+        """Set a known field on the dataclass and its dict mirror; False if its parent isn't there"""
+        parent_of, parent_keys, attr = resolver
+        try:
+            parent = parent_of(self)
+        except AttributeError:
+            return False  # An ancestor was overwritten with a plain value
+        if not is_dataclass(parent):
+            return False  # e.g. a str or dict written over the sub-object
+        setattr(parent, attr, value)
+        mirror = self._dict
+        for key in parent_keys:
+            mirror = mirror[key]
+        # asdict() copies containers; do the same so the mirror never aliases them
+        mirror[attr] = deepcopy(value) if isinstance(value, (list, dict)) else value
+        return True
+
     def set_field(self, path: str, value: Any) -> bool:
+        resolver = _PATH_RESOLVERS.get(path)
+        if resolver is not None and self._write(resolver, value):
+            self._invalidate_json()
+            return True
+        
         parts = path.split('.')
         obj = self
         
         for part in parts[:-1]:
-            if hasattr(obj, part):
-                obj = getattr(obj, part)
-            else:
+            obj = getattr(obj, part, _MISSING)
+            if obj is _MISSING:
                 return False
         
         final_field = parts[-1]
-        if hasattr(obj, final_field):
+        if getattr(obj, final_field, _MISSING) is not _MISSING:
             setattr(obj, final_field, value)
+            # Rare (whole sub-objects, odd paths): just rebuild the mirror
+            self._dict = asdict(self)
+            self._invalidate_json()
             return True
         return False
 
+    def update_fields(self, data: Dict[str, Any]) -> bool:
+        """Apply a batch of path -> value updates; False if any path was rejected"""
+        applied_all = True
+        for path, value in data.items():
+            resolver = _PATH_RESOLVERS.get(path)
+            if resolver is not None and self._write(resolver, value):
+                continue
+            if not self.set_field(path, value):
+                applied_all = False
+        self._invalidate_json()
+        return applied_all
+
 
 # UX IMPROVEMENT: Page-based grouping for better flow
 FIELD_PAGES = [
@@ -252,21 +336,24 @@ FIELD_PAGES = [
         "title": "Project Overview",
         "description": "Now let's talk about your innovation project",
         "type": "interview",  # Single-question AI mode
-        "field": "project.title"
+        "field": "project.title",
+        "required": True
     },
     {
         "id": "project_challenge",
         "title": "Project Challenge",
         "description": "What problem are you solving?",
         "type": "interview",
-        "field": "project.challenge"
+        "field": "project.challenge",
+        "required": True
     },
     {
         "id": "project_description",
         "title": "Innovation Description",
         "description": "What will you develop or achieve?",
         "type": "interview",
-        "field": "project.description"
+        "field": "project.description",
+        "required": True
     },
     {
         "id": "project_uncertainty",
@@ -280,7 +367,8 @@ FIELD_PAGES = [
         "title": "External Expertise",
         "description": "What expertise do you need?",
         "type": "interview",
-        "field": "project.skills_required"
+        "field": "project.skills_required",
+        "required": True
     },
     {
         "id": "project_objectives",
@@ -312,26 +400,39 @@ FIELD_PAGES = [
     }
 ]
 
-# Required fields for validation
+def _page_fields(page):
+    """(path, required) for each field a page collects: its form fields, or its one interview field"""
+    if page["type"] == "form":
+        return [(f["path"], f["required"]) for f in page["fields"]]
+    return [(page["field"], page.get("required", False))]
+
+
+# Flat field list, one entry per form field or interview page, in page order
+FIELD_ORDER = [
+    path
+    for page in FIELD_PAGES
+    for path, _ in _page_fields(page)
+]
+
+# Required fields for validation, derived from the same "required" flags the pages carry
 REQUIRED_FIELDS = [
-    "company.legal_name",
-    "company.cro_number",
-    "company.registered_address.line1",
-    "company.registered_address.city",
-    "company.registered_address.county",
-    "contacts.primary.name",
-    "contacts.primary.email",
-    "project.title",
-    "project.challenge",
-    "project.description",
-    "project.skills_required",
+    path
+    for page in FIELD_PAGES
+    for path, required in _page_fields(page)
+    if required
 ]
+# Membership checks (is this field required?) run every turn: hash lookup, not a list scan
+REQUIRED_FIELDS_SET = frozenset(REQUIRED_FIELDS)
 
-# Backwards compatibility: Extract flat field list from FIELD_PAGES
-FIELD_ORDER = []
-for page in FIELD_PAGES:
-    if page["type"] == "form":
-        for field_config in page["fields"]:
-            FIELD_ORDER.append(field_config["path"])
-    else:  # interview
-        FIELD_ORDER.append(page["field"])
+# Field paths per top-level section ("company", "contacts", "project"), in FIELD_ORDER order
+SECTION_FIELDS: Dict[str, Tuple[str, ...]] = {}
+for _path in FIELD_ORDER:
+    _section = _path.split(".", 1)[0]
+    SECTION_FIELDS[_section] = SECTION_FIELDS.get(_section, ()) + (_path,)
+
+# Dotted path -> (parent getter, parent keys in to_dict(), final attribute), compiled once
+# so get_field/set_field resolve known fields with one dict lookup and a C-level attrgetter
+_PATH_RESOLVERS = {}
+for _path in FIELD_ORDER:
+    _parent, _, _attr = _path.rpartition(".")
+    _PATH_RESOLVERS[_path] = (attrgetter(_parent), tuple(_parent.split(".")), _attr)
@@ -4,27 +4,179 @@ Implements the agent loop from the implementation brief.
 """
 
 import json
-from agent_exceptions import AgentContractError, AgentValidationError, AgentProcessingError
+import os
+from collections import deque
+from functools import cached_property
+import jiter
+import orjson
+from agent_exceptions import AgentContractError, AgentTruncationError, AgentValidationError, AgentProcessingError
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Deque, Iterator, Set, Tuple
 from openai import OpenAI
-from application_schema import ApplicationSchema, FIELD_ORDER, REQUIRED_FIELDS
+from application_schema import ApplicationSchema, FIELD_ORDER, FIELD_PAGES, REQUIRED_FIELDS_SET
+from llm_cache import ResponseCache
+
+
+# Model is a deployment switch: point it at a cheaper or fine-tuned model (or an
+# OpenAI-compatible endpoint via OPENAI_BASE_URL) without touching code.
+# The response cache keys on the model, so switching never serves stale replies.
+AGENT_MODEL = os.environ.get("AGENT_MODEL", "gpt-4o-mini")
+# Short factual answers need extraction, not judgement: route them to a smaller tier
+AGENT_MODEL_SHORT = os.environ.get("AGENT_MODEL_SHORT", "gpt-4.1-nano")
+SHORT_ANSWER_FIELDS = frozenset({"project.title", "project.timeline"})
+AGENT_TEMPERATURE = 0.3
+# JSON mode: the API guarantees a bare JSON object (no fences or prose to strip)
+AGENT_RESPONSE_FORMAT = {"type": "json_object"}
+# Output budget: a base for the JSON envelope, summary and question, plus room that grows
+# with the answer, which the reply restates twice (extracted_data and summary_for_user).
+# A reply cut off at the cap raises AgentTruncationError rather than being retried.
+AGENT_MAX_TOKENS = 1000
+# Short-answer fields echo a few words, so their base can be much lower
+AGENT_MAX_TOKENS_SHORT = 300
+# Extra output tokens per character of user input: ~4 characters per token, restated twice
+AGENT_TOKENS_PER_INPUT_CHAR = 0.5
+
+# Rule 1: keys every agent reply must contain
+REQUIRED_RESPONSE_KEYS = ("acknowledgement", "extracted_data", "summary_for_user", "confidence", "next_question")
+
+# Exchanges kept per session; older ones fall off so session memory stays bounded
+HISTORY_LIMIT = 50
+
+# User inputs that skip the current (optional) field
+SKIP_COMMANDS = frozenset({"skip", "skip this", "pass"})
+
+# Retry instructions, built once rather than per failed attempt
+_MISSING_KEYS_CORRECTION = "CORRECTION: Your previous response was missing these required keys: {}. Respond with valid JSON containing all required keys."
+_INVALID_JSON_CORRECTION = "CORRECTION: Your previous response was not valid JSON. Respond ONLY with valid JSON, no markdown, no code fences."
+
+
+# Natural-language question per field, built once at import
+FIELD_QUESTIONS = {
+    "company.legal_name": "What's your company's legal name?",
+    "company.trading_name": "Do you trade under a different name, or is it the same as your legal name?",
+    "company.cro_number": "What's your CRO number?",
+    "company.incorporation_date": "When was the company incorporated?",
+    "company.registered_address.line1": "What's the first line of your registered address?",
+    "company.registered_address.line2": "Is there a second line for the address, or can we skip that?",
+    "company.registered_address.city": "What city or town?",
+    "company.registered_address.county": "What county?",
+    "company.registered_address.eircode": "What's the Eircode?",
+    "company.website": "Do you have a website?",
+    "company.primary_activity": "What sector or industry does the company operate in?",
+    "company.description": "Can you describe what the company does in a sentence or two?",
+    "company.employees.full_time": "How many full-time employees do you have?",
+    "company.employees.part_time": "How many part-time employees?",
+    
+    "contacts.primary.name": "Who should I put as the main contact for this application?",
+    "contacts.primary.title": "What's their job title?",
+    "contacts.primary.email": "What's their email address?",
+    "contacts.primary.phone": "And their phone number?",
+    
+    "project.title": "Let's talk about the project. What would you call it?",
+    "project.challenge": "What's the main problem or challenge you're trying to solve?",
+    "project.description": "What's the innovation you're proposing? What are you aiming to develop or achieve?",
+    "project.technical_uncertainty": "What are the technical or knowledge gaps? What don't you know how to do yet?",
+    "project.skills_required": "What kind of external expertise or facilities do you need that you don't have in-house?",
+    "project.objectives": "What are the main objectives or goals of this project? Tell me the key things you want to achieve.",
+    "project.deliverables": "What will you actually deliver at the end? Think reports, prototypes, validated findings, etc.",
+    "project.commercial_impact": "How will this benefit your company commercially? Why does this matter for your business?",
+    "project.timeline": "How long do you think this project will take?",
+}
+
+# Section of each field ("company", "contacts", "project"), resolved once instead of by prefix tests
+FIELD_SECTIONS = {path: path.split(".", 1)[0] for path in FIELD_ORDER}
+# Review label of each field, e.g. "company.cro_number" -> "Cro Number"
+FIELD_LABELS = {path: path.rsplit(".", 1)[-1].replace("_", " ").title() for path in FIELD_ORDER}
+
+
+def _build_field_guide() -> str:
+    """Static catalogue of every interview field, in order, from FIELD_PAGES"""
+    lines = []
+    for page in FIELD_PAGES:
+        if page["type"] == "form":
+            entries = [(f["path"], f["label"], f.get("help")) for f in page["fields"]]
+        else:  # interview
+            entries = [(page["field"], page["title"], page.get("description"))]
+        for path, label, hint in entries:
+            marker = "required" if path in REQUIRED_FIELDS_SET else "optional"
+            lines.append(f"- {path} ({marker}): {label}" + (f" - {hint}" if hint else ""))
+    return "\n".join(lines)
+
+
+# PROMPT CACHING: everything static lives in the system prompt so the request
+# prefix is byte-identical (and long enough to be cached) on every turn
+_TURN_PROTOCOL = """FIELD GUIDE (interview order; extracted_data keys MUST use these exact paths):
+""" + _build_field_guide() + """
+
+EACH TURN you receive a JSON object with current_field, field_question, is_required,
+completed_fields, user_input and known_data (the answers already collected in the current
+section, keyed by path). Extract data from user_input and determine
+the next question. If an "instruction" key is present, it is a correction you must follow."""
+
+
+def _context_message(context: Dict[str, Any], known_data_json: str) -> str:
+    """Compact JSON for the turn context, splicing in the schema's cached known_data JSON"""
+    dynamic = orjson.dumps(context).decode()
+    return f'{dynamic[:-1]},"known_data":{known_data_json}}}'
+
+
+def _max_tokens_for(base: int, user_input: str) -> int:
+    """Output ceiling for one reply: the base plus room for restating this answer"""
+    return base + int(len(user_input) * AGENT_TOKENS_PER_INPUT_CHAR)
+
+
+def _truncated(max_tokens: int) -> AgentTruncationError:
+    """Error for a reply that stopped at its output ceiling"""
+    return AgentTruncationError(
+        f"Agent reply hit the {max_tokens}-token output limit and was cut off; "
+        "retrying the same prompt would be cut off again"
+    )
 
 
 class AgentState:
     """Tracks conversation state"""
+    # Fixed attribute set, touched every turn: slot access and no per-instance __dict__
+    __slots__ = (
+        "current_field_index",
+        "completed_fields",
+        "skipped_fields",
+        "completed_set",
+        "skipped_set",
+        "confidence_flags",
+        "user_turns",
+        "agent_turns",
+        "in_review_mode",
+        "review_edits",
+        "pending_confirmation",
+    )
+    
     def __init__(self):
         self.current_field_index: int = 0
         self.completed_fields: List[str] = []
         self.skipped_fields: List[str] = []
+        # Set mirrors of the ordered lists above, for O(1) membership checks
+        self.completed_set: Set[str] = set()
+        self.skipped_set: Set[str] = set()
         self.confidence_flags: Dict[str, str] = {}
-        self.conversation_history: List[Dict[str, str]] = []
+        # Bounded: history is a log only (Rule 6 - state is never inferred from it).
+        # Parallel deques, one entry each per exchange, instead of a dict per turn
+        self.user_turns: Deque[str] = deque(maxlen=HISTORY_LIMIT)
+        self.agent_turns: Deque[str] = deque(maxlen=HISTORY_LIMIT)
         self.in_review_mode: bool = False
         self.review_edits: Dict[str, Any] = {}
         
         # UX IMPROVEMENT: Confirmation state for AI-transformed answers
         self.pending_confirmation: Optional[Dict[str, Any]] = None
     
+    def record_exchange(self, user: str, agent: str):
+        """Log one user/agent exchange"""
+        self.user_turns.append(user)
+        self.agent_turns.append(agent)
+    
+    def history_pairs(self) -> Iterator[Tuple[str, str]]:
+        """(user, agent) pairs, oldest first"""
+        return zip(self.user_turns, self.agent_turns)
+    
     def get_current_field(self) -> Optional[str]:
         """Get the field we're currently collecting"""
         if self.current_field_index < len(FIELD_ORDER):
@@ -34,15 +186,19 @@ class AgentState:
     def advance(self):
         """Move to next field"""
         current = self.get_current_field()
-        if current:
+        # A re-answered field is already recorded: keep the list and its set mirror identical
+        if current and current not in self.completed_set:
             self.completed_fields.append(current)
+            self.completed_set.add(current)
         self.current_field_index += 1
     
     def skip_current(self):
         """Skip current field and advance"""
         current = self.get_current_field()
-        if current and current not in REQUIRED_FIELDS:
-            self.skipped_fields.append(current)
+        if current and current not in REQUIRED_FIELDS_SET:
+            if current not in self.skipped_set:
+                self.skipped_fields.append(current)
+                self.skipped_set.add(current)
             self.current_field_index += 1
             return True
         return False
@@ -53,8 +209,9 @@ class AgentState:
             self.current_field_index -= 1
             # Remove from completed if present
             prev_field = self.get_current_field()
-            if prev_field in self.completed_fields:
+            if prev_field in self.completed_set:
                 self.completed_fields.remove(prev_field)
+                self.completed_set.discard(prev_field)
             return True
         return False
     
@@ -94,13 +251,7 @@ class AgentState:
         current = self.get_current_field()
         if not current:
             return "complete"
-        if current.startswith("company"):
-            return "company"
-        elif current.startswith("contacts"):
-            return "contacts"
-        elif current.startswith("project"):
-            return "project"
-        return "unknown"
+        return FIELD_SECTIONS.get(current, "unknown")
 
 
 class ConversationAgent:
@@ -156,6 +307,8 @@ REWRITING PRINCIPLES:
 - Remove filler words and conversational hedges
 - Structure information clearly with specific outcomes
 
+""" + _TURN_PROTOCOL + """
+
 Response format (MUST be valid JSON):
 {
   "acknowledgement": "Brief acknowledgement",
@@ -168,72 +321,103 @@ Response format (MUST be valid JSON):
 CRITICAL: Your response must be ONLY valid JSON. No markdown, no code fences, no explanations.
 CRITICAL: next_question MUST be a question ending with "?" - declarative statements are forbidden."""
 
-def __init__(self, api_key: Optional[str] = None):
-    if api_key:
-        self.client = OpenAI(api_key=api_key)
-    else:
-        self.client = OpenAI()
-self.schema = ApplicationSchema()
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[ResponseCache] = None,
+                 client: Optional[OpenAI] = None):
+        # A shared client (e.g. cached by the UI) reuses one connection pool across sessions;
+        # otherwise the client property builds one on first use
+        self._api_key = api_key
+        if client is not None:
+            self.client = client
+        self.schema = ApplicationSchema()
         self.state = AgentState()
-
+        # Optional exact-match response cache (None = always call the API)
+        self.cache = cache
+    
+    @cached_property
+    def client(self) -> OpenAI:
+        """OpenAI client, built lazily so constructing an agent does no HTTP/TLS setup"""
+        return OpenAI(api_key=self._api_key) if self._api_key else OpenAI()
     
     def _get_field_question(self, field_path: str) -> str:
         """Map field to natural question"""
-        questions = {
-            "company.legal_name": "What's your company's legal name?",
-            "company.trading_name": "Do you trade under a different name, or is it the same as your legal name?",
-            "company.cro_number": "What's your CRO number?",
-            "company.incorporation_date": "When was the company incorporated?",
-            "company.registered_address.line1": "What's the first line of your registered address?",
-            "company.registered_address.line2": "Is there a second line for the address, or can we skip that?",
-            "company.registered_address.city": "What city or town?",
-            "company.registered_address.county": "What county?",
-            "company.registered_address.eircode": "What's the Eircode?",
-            "company.website": "Do you have a website?",
-            "company.primary_activity": "What sector or industry does the company operate in?",
-            "company.description": "Can you describe what the company does in a sentence or two?",
-            "company.employees.full_time": "How many full-time employees do you have?",
-            "company.employees.part_time": "How many part-time employees?",
-            
-            "contacts.primary.name": "Who should I put as the main contact for this application?",
-            "contacts.primary.title": "What's their job title?",
-            "contacts.primary.email": "What's their email address?",
-            "contacts.primary.phone": "And their phone number?",
-            
-            "project.title": "Let's talk about the project. What would you call it?",
-            "project.challenge": "What's the main problem or challenge you're trying to solve?",
-            "project.description": "What's the innovation you're proposing? What are you aiming to develop or achieve?",
-            "project.technical_uncertainty": "What are the technical or knowledge gaps? What don't you know how to do yet?",
-            "project.skills_required": "What kind of external expertise or facilities do you need that you don't have in-house?",
-            "project.objectives": "What are the main objectives or goals of this project? Tell me the key things you want to achieve.",
-            "project.deliverables": "What will you actually deliver at the end? Think reports, prototypes, validated findings, etc.",
-            "project.commercial_impact": "How will this benefit your company commercially? Why does this matter for your business?",
-            "project.timeline": "How long do you think this project will take?",
-        }
-        return questions.get(field_path, "Can you provide more information?")
+        return FIELD_QUESTIONS.get(field_path, "Can you provide more information?")
     
-    def _build_context(self, user_input: str) -> Dict[str, Any]:
+    def _build_context(self, user_input: str, current_field: Optional[str]) -> Dict[str, Any]:
         """Build structured context for LLM"""
-        current_field = self.state.get_current_field()
-        
         return {
             "current_field": current_field,
             "field_question": self._get_field_question(current_field) if current_field else None,
-            "is_required": current_field in REQUIRED_FIELDS if current_field else False,
-            "known_data": self.schema.to_dict(),
+            "is_required": current_field in REQUIRED_FIELDS_SET if current_field else False,
             "completed_fields": self.state.completed_fields,
-            "user_input": user_input,
-            "instruction": "Extract data from user input and determine next question"
+            "user_input": user_input
         }
     
-    def process_input(self, user_input: str) -> Dict[str, Any]:
+    def _stream_completion(self, messages: List[Dict[str, str]], model: str, max_tokens: int,
+                           on_partial: Callable[[Dict[str, Any]], None]) -> str:
+        """Stream the reply, handing each partially-parsed JSON object to on_partial"""
+        stream = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=AGENT_TEMPERATURE,
+            max_tokens=max_tokens,
+            response_format=AGENT_RESPONSE_FORMAT,
+            stream=True,
+        )
+        buffer = ""
+        finish_reason = None
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            # Set on the final chunk only
+            finish_reason = choice.finish_reason or finish_reason
+            delta = choice.delta.content
+            if not delta:
+                continue
+            buffer += delta
+            try:
+                partial = jiter.from_json(buffer.encode("utf-8"), partial_mode="trailing-strings")
+            except ValueError:
+                continue  # Not parseable yet; keep accumulating
+            if isinstance(partial, dict):
+                on_partial(partial)
+        if finish_reason == "length":
+            raise _truncated(max_tokens)
+        return buffer.strip()
+    
+    def _fetch_completion(self, messages: List[Dict[str, str]], model: str, max_tokens: int,
+                          on_partial: Optional[Callable[[Dict[str, Any]], None]] = None) -> str:
+        """One completion call, streamed when a partial-result callback is given"""
+        if on_partial is not None:
+            return self._stream_completion(messages, model, max_tokens, on_partial)
+        response = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=AGENT_TEMPERATURE,
+            max_tokens=max_tokens,
+            response_format=AGENT_RESPONSE_FORMAT,
+        )
+        choice = response.choices[0]
+        if choice.finish_reason == "length":
+            raise _truncated(max_tokens)
+        return choice.message.content.strip()
+    
+    def process_input(self, user_input: str,
+                      on_partial: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
         """
         Main agent loop:
         User input → Interpret → Extract → Update schema → Update state → Respond
+        
+        If on_partial is given the reply is streamed and on_partial receives the
+        partially-parsed response as tokens arrive (display only - the contract
+        is still enforced on the complete response).
         """
         
+        # Read once: the field only changes via the state methods below
+        current_field = self.state.get_current_field()
+        
         # Check for skip command
-        if user_input.lower().strip() in ["skip", "skip this", "pass"]:
+        if user_input.lower().strip() in SKIP_COMMANDS:
             if self.state.skip_current():
                 next_field = self.state.get_current_field()
                 return {
@@ -249,45 +433,61 @@ self.schema = ApplicationSchema()
                     "extracted_data": {},
                     "summary_for_user": "This field cannot be skipped.",
                     "confidence": "high",
-                    "next_question": self._get_field_question(self.state.get_current_field())
+                    "next_question": self._get_field_question(current_field)
                 }
         
         # Build context
-        context = self._build_context(user_input)
+        context = self._build_context(user_input, current_field)
+        if current_field in SHORT_ANSWER_FIELDS:
+            model, max_tokens = AGENT_MODEL_SHORT, AGENT_MAX_TOKENS_SHORT
+        else:
+            model, max_tokens = AGENT_MODEL, AGENT_MAX_TOKENS
+        max_tokens = _max_tokens_for(max_tokens, user_input)
+        
+        # Only the current section's filled answers go to the model (the rest is token cost with
+        # no bearing on this field); the JSON is cached on the schema until the next write
+        if current_field:
+            known_data_json = self.schema.section_json(FIELD_SECTIONS[current_field])
+        else:
+            known_data_json = self.schema.to_json()
         
         # Call LLM with retry logic
         max_retries = 1
         raw = None
+        cache_key = None
         
         for attempt in range(max_retries + 1):
             try:
-                response = self.client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {"role": "system", "content": self.SYSTEM_PROMPT},
-                        {"role": "user", "content": json.dumps(context, indent=2)}
-                    ],
-                    temperature=0.3,
-                )
+                messages = [
+                    {"role": "system", "content": self.SYSTEM_PROMPT},
+                    # Compact JSON: indentation only costs input tokens
+                    {"role": "user", "content": _context_message(context, known_data_json)}
+                ]
                 
-                raw = response.choices[0].message.content.strip()
+                # Identical context = identical state, so a cached reply is safe to reuse
+                raw = None
+                if self.cache is not None:
+                    cache_key = self.cache.make_key(model, AGENT_TEMPERATURE, messages)
+                    raw = self.cache.get(cache_key)
+                # Only a fresh reply is written back: re-setting a hit would rewrite the file
+                # and restart its TTL on every reuse
+                fetched = raw is None
                 
-                # Remove markdown fences if present
-                if raw.startswith("```"):
-                    raw = raw.split("```")[1]
-                    if raw.startswith("json"):
-                        raw = raw[4:]
+                if fetched:
+                    # Concurrent sessions with the same context share one API call
+                    fetch = lambda: self._fetch_completion(messages, model, max_tokens, on_partial)
+                    raw = self.cache.single_flight(cache_key, fetch) if cache_key else fetch()
                 
-                result = json.loads(raw)
+                # orjson.JSONDecodeError subclasses json.JSONDecodeError, so the retry below still applies
+                result = orjson.loads(raw)
                 
                 # Validate required keys (Rule 1 enforcement)
-                required_keys = ["acknowledgement", "extracted_data", "summary_for_user", "confidence", "next_question"]
-                missing_keys = [k for k in required_keys if k not in result]
+                missing_keys = [k for k in REQUIRED_RESPONSE_KEYS if k not in result]
                 
                 if missing_keys:
                     if attempt < max_retries:
                         # Retry with correction prompt
-                        context["instruction"] = f"CORRECTION: Your previous response was missing these required keys: {missing_keys}. Respond with valid JSON containing all required keys."
+                        context["instruction"] = _MISSING_KEYS_CORRECTION.format(missing_keys)
                         continue
                     else:
                         raise ValueError(f"Agent response missing required keys: {missing_keys}")
@@ -298,7 +498,7 @@ self.schema = ApplicationSchema()
             except json.JSONDecodeError as e:
                 if attempt < max_retries:
                     # Retry with correction prompt
-                    context["instruction"] = "CORRECTION: Your previous response was not valid JSON. Respond ONLY with valid JSON, no markdown, no code fences."
+                    context["instruction"] = _INVALID_JSON_CORRECTION
                     continue
                 else:
                     # Hard error after retry
@@ -308,16 +508,16 @@ self.schema = ApplicationSchema()
         next_q = result.get("next_question", "")
         if next_q != "COMPLETE":
             # CRITICAL: Agent must ask explicit question, not make declarative statements
-            if not next_q or not next_q.strip():
+            question = next_q.strip() if next_q else ""
+            if not question:
                 raise AgentContractError("Agent contract violation: next_question cannot be empty")
             
             # Must end with question mark (interview discipline)
-            if not next_q.strip().endswith("?"):
+            if not question.endswith("?"):
                 raise AgentContractError(f"Agent contract violation: Response must end with explicit question. Got: '{next_q}'")
             
             # Check for multiple questions
-            question_indicators = next_q.count("?")
-            if question_indicators > 1:
+            if question.count("?") > 1:
                 raise AgentContractError(f"Agent contract violation: Multiple questions detected in next_question. Only one question allowed per turn.")
         
         # Rule 4 enforcement: Require confirmation before advancing
@@ -325,8 +525,11 @@ self.schema = ApplicationSchema()
         if result.get("extracted_data") and not result.get("summary_for_user"):
             raise AgentContractError("Agent contract violation: Cannot advance without providing summary_for_user confirmation.")
         
+        # Only cache replies that passed every contract check, so retries are never poisoned
+        if cache_key and fetched:
+            self.cache.set(cache_key, raw)
+        
         # STAGE 2: Weak answer detection - prevent advancement if confidence is low and this is a project field
-        current_field = self.state.get_current_field()
         if (result.get("confidence") == "low" and 
             current_field and 
             current_field.startswith("project.") and
@@ -335,18 +538,17 @@ self.schema = ApplicationSchema()
             # Low confidence on project field with data = weak answer detected
             # Do NOT advance - the next_question should be a follow-up
             # Store in history but don't update schema or advance state
-            self.state.conversation_history.append({
-                "user": user_input,
-                "agent": result.get("summary_for_user", "") + "\n\n[Quality check: Answer needs more detail]"
-            })
+            self.state.record_exchange(
+                user_input,
+                result.get("summary_for_user", "") + "\n\n[Quality check: Answer needs more detail]"
+            )
             
             # Return result with follow-up question, no advancement
             return result
         
         # Update schema with extracted data ONLY after summary provided and quality check passed
         if result.get("extracted_data") and result.get("summary_for_user"):
-            for field_path, value in result["extracted_data"].items():
-                self.schema.set_field(field_path, value)
+            self.schema.update_fields(result["extracted_data"])
             
             # Update state
             if current_field and result.get("confidence"):
@@ -356,23 +558,20 @@ self.schema = ApplicationSchema()
             self.state.advance()
             
             # Store in history
-            self.state.conversation_history.append({
-                "user": user_input,
-                "agent": result.get("summary_for_user", "")
-            })
+            self.state.record_exchange(user_input, result.get("summary_for_user", ""))
             
-            # Check if complete
-            if self.state.is_complete():
+            # The state machine decides completion, whatever the model said (one lookup covers both ways)
+            next_field = self.state.get_current_field()
+            if next_field is None:
                 result["next_question"] = "COMPLETE"
             elif result.get("next_question") == "COMPLETE":
-                # Override if not actually complete
-                next_field = self.state.get_current_field()
-                if next_field:
-                    result["next_question"] = self._get_field_question(next_field)
+                result["next_question"] = self._get_field_question(next_field)
             
             return result
-            
+        
+        # Nothing extracted (e.g. a clarifying follow-up): stay on this field and relay the question
         # All errors are hard errors - no soft fallbacks (Rule 7)
+        return result
     
     def start_conversation(self) -> str:
         """Get the first question"""
@@ -402,11 +601,11 @@ self.schema = ApplicationSchema()
         }
         
         for field_path in FIELD_ORDER:
-            section = field_path.split(".")[0]
+            section = FIELD_SECTIONS[field_path]
             value = self.schema.get_field(field_path)
             confidence = self.state.confidence_flags.get(field_path, "unknown")
-            is_skipped = field_path in self.state.skipped_fields
-            is_required = field_path in REQUIRED_FIELDS
+            is_skipped = field_path in self.state.skipped_set
+            is_required = field_path in REQUIRED_FIELDS_SET
             
             # STAGE 2: Enhanced risk assessment
             risk_level = "none"
@@ -427,7 +626,7 @@ self.schema = ApplicationSchema()
             
             field_data = {
                 "path": field_path,
-                "label": field_path.split(".")[-1].replace("_", " ").title(),
+                "label": FIELD_LABELS[field_path],
                 "value": value,
                 "confidence": confidence,
                 "skipped": is_skipped,
@@ -450,11 +649,12 @@ self.schema = ApplicationSchema()
         
         # Count quality metrics
         total_fields = len(FIELD_ORDER)
-        completed_fields = len([f for f in FIELD_ORDER if f not in self.state.skipped_fields])
+        skipped = self.state.skipped_set
+        completed_fields = total_fields - len(skipped)
         high_confidence = sum(1 for f in self.state.confidence_flags.values() if f == "high")
         low_confidence = sum(1 for f in self.state.confidence_flags.values() if f == "low")
-        skipped_required = len([f for f in self.state.skipped_fields if f in REQUIRED_FIELDS])
-        skipped_optional = len(self.state.skipped_fields) - skipped_required
+        skipped_required = len(skipped & REQUIRED_FIELDS_SET)
+        skipped_optional = len(skipped) - skipped_required
         
         # Assess project section quality (most critical for grant)
         project_fields = [f for f in sections["project"] if not f["skipped"]]
@@ -525,10 +725,3 @@ self.schema = ApplicationSchema()
             "expected_deliverables": ", ".join(self.schema.project.deliverables) if self.schema.project.deliverables else "",
             "company_benefit": self.schema.project.commercial_impact or "",
         }
-
-
-def init_agent():
-    """Initialize agent in session state"""
-    if "agent" not in st.session_state:
-        st.session_state.agent = ConversationAgent()
-    return st.session_state.agent
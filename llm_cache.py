@@ -0,0 +1,135 @@
+"""
+Persistent response cache for agent LLM calls
+Exact-match only: the key covers model, temperature and the full message list
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional
+
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MEMORY_ENTRIES = 256
+# Longest a request waits on an identical in-flight one before calling the API itself
+DEFAULT_SINGLE_FLIGHT_TIMEOUT_SECONDS = 60
+
+
+class _LeaderInterrupted(Exception):
+    """The shared fetch was cut short by its own session (rerun/stop); others must fetch themselves"""
+
+
+class ResponseCache:
+    """On-disk cache of raw completion text, one JSON file per request"""
+
+    def __init__(self, cache_dir: str, ttl_seconds: int = DEFAULT_TTL_SECONDS,
+                 memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+                 single_flight_timeout: float = DEFAULT_SINGLE_FLIGHT_TIMEOUT_SECONDS):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        # In-process LRU in front of the files: repeat hits skip disk I/O and JSON parsing
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        self._in_flight_lock = threading.Lock()
+        self.single_flight_timeout = single_flight_timeout
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(model: str, temperature: float, messages: List[Dict[str, Any]]) -> str:
+        """Stable hash of everything that determines the completion"""
+        payload = json.dumps([model, temperature, messages], sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _remember(self, key: str, created: float, content: str):
+        with self._memory_lock:
+            self._memory[key] = (created, content)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return cached completion text, or None on miss/expiry"""
+        with self._memory_lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+        if entry is not None:
+            created, content = entry
+        else:
+            try:
+                with open(self._path(key), encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                return None
+            created, content = entry.get("created", 0), entry.get("content")
+            if content is not None:
+                self._remember(key, created, content)
+        if time.time() - created > self.ttl_seconds:
+            self._forget(key)
+            return None
+        return content
+    
+    def _forget(self, key: str):
+        """Drop an expired entry from memory and disk (it holds a user's answers)"""
+        with self._memory_lock:
+            self._memory.pop(key, None)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+    
+    def set(self, key: str, content: str):
+        """Store completion text (atomic replace, safe across sessions)"""
+        created = time.time()
+        self._remember(key, created, content)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"created": created, "content": content}, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Cache is best-effort; never fail a turn because of it
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    def single_flight(self, key: str, fetch: Callable[[], str]) -> str:
+        """Run fetch() once per key at a time; concurrent identical requests share its result"""
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+        
+        if not leader:
+            try:
+                return future.result(timeout=self.single_flight_timeout)
+            except (_LeaderInterrupted, FutureTimeoutError):
+                # The leader's session was interrupted, or it is taking too long: don't depend on it
+                return fetch()
+        
+        try:
+            content = fetch()
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        except BaseException:
+            # Streamlit's RerunException/StopException (raised mid-stream by on_partial) and
+            # KeyboardInterrupt belong to this session only; never re-raise them in another one
+            future.set_exception(_LeaderInterrupted())
+            raise
+        else:
+            future.set_result(content)
+            return content
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
@@ -2,7 +2,31 @@ from PyPDF2 import PdfReader, PdfWriter
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 from io import BytesIO
+from collections import OrderedDict
+from functools import lru_cache
+import json
+import os
 import textwrap
+import threading
+
+
+# Recently filled PDFs (~0.5 MB each), keyed on everything that determines the output
+_FILLED_CACHE_SIZE = 8
+_filled_cache = OrderedDict()
+_filled_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4)
+def _load_template_bytes(template_path, mtime_ns):
+    """Read the blank template once per version; mtime_ns is only part of the cache key"""
+    with open(template_path, "rb") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=8)
+def _text_wrapper(width):
+    """One TextWrapper per width, reused across fields (textwrap.wrap builds a new one per call)"""
+    return textwrap.TextWrapper(width=width)
 
 
 def draw_wrapped_text(c, text, x, y, max_width=90, line_height=14):
@@ -10,33 +34,38 @@ def draw_wrapped_text(c, text, x, y, max_width=90, line_height=14):
     Draw wrapped text line-by-line onto a PDF canvas.
     max_width is approx characters per line (PDF has no layout engine).
     """
+    wrap = _text_wrapper(max_width).wrap
     lines = []
     for paragraph in text.split("\n"):
-        lines.extend(textwrap.wrap(paragraph, max_width))
+        lines.extend(wrap(paragraph))
         lines.append("")
+    # One text object (a single BT/ET block) for the whole field instead of one per line
+    text_object = c.beginText(x, y)
+    text_object.setLeading(line_height)
     for line in lines:
-        c.drawString(x, y, line)
-        y -= line_height
-    return y
+        text_object.textLine(line)
+    c.drawText(text_object)
+    return text_object.getY()
 
 
-def fill_application_pdf(template_path, output_path, answers, field_map):
-    reader = PdfReader(template_path)
+def _render_application_pdf(template_path, template_mtime_ns, answers, field_map):
+    """field_map is a sequence of (answer key, page, x, y), ordered by page"""
+    # Parse a fresh reader each call: merge_page mutates the template pages
+    reader = PdfReader(BytesIO(_load_template_bytes(template_path, template_mtime_ns)))
     writer = PdfWriter()
     packet = BytesIO()
     c = canvas.Canvas(packet, pagesize=A4)
     current_page = 0
     
-    for key, cfg in field_map.items():
-        target_page = cfg["page"]
+    for key, target_page, x, y in field_map:
         while current_page < target_page:
             c.showPage()
             current_page += 1
         draw_wrapped_text(
             c,
             answers.get(key, ""),
-            x=cfg["x"],
-            y=cfg["y"],
+            x=x,
+            y=y,
             max_width=95,
             line_height=14
         )
@@ -45,10 +74,38 @@ def fill_application_pdf(template_path, output_path, answers, field_map):
     packet.seek(0)
     overlay = PdfReader(packet)
     
+    # merge_page re-parses the template page's content stream, so only merge
+    # pages that actually carry text; the overlay's other pages are blank
+    text_pages = {page for key, page, _, _ in field_map if answers.get(key)}
     for i, page in enumerate(reader.pages):
-        if i < len(overlay.pages):
+        if i in text_pages and i < len(overlay.pages):
             page.merge_page(overlay.pages[i])
         writer.add_page(page)
     
-    with open(output_path, "wb") as f:
-        writer.write(f)
+    out = BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def fill_application_pdf(template_path, output_path, answers, field_map):
+    # Identical answers on the same template version render identical bytes: reuse them
+    # across reruns and sessions. The mtime makes a replaced template a cache miss.
+    template_mtime_ns = os.stat(template_path).st_mtime_ns
+    key = json.dumps([template_path, template_mtime_ns, answers, field_map], sort_keys=True, default=str)
+    with _filled_cache_lock:
+        pdf_bytes = _filled_cache.get(key)
+        if pdf_bytes is not None:
+            _filled_cache.move_to_end(key)
+    
+    if pdf_bytes is None:
+        pdf_bytes = _render_application_pdf(template_path, template_mtime_ns, answers, field_map)
+        with _filled_cache_lock:
+            _filled_cache[key] = pdf_bytes
+            while len(_filled_cache) > _FILLED_CACHE_SIZE:
+                _filled_cache.popitem(last=False)
+    
+    # output_path is optional so callers can serve the bytes directly
+    if output_path:
+        with open(output_path, "wb") as f:
+            f.write(pdf_bytes)
+    return pdf_bytes
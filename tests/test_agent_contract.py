@@ -7,120 +7,209 @@ If these tests pass after being weakened, the architecture is broken.
 """
 
 import pytest
-import json
-from unittest.mock import Mock, patch, MagicMock
-from conversation_agent import ConversationAgent, AgentState
+import ast
+import inspect
+import re
+import orjson
+from pathlib import Path
+from dataclasses import fields
+from types import SimpleNamespace
+from conversation_agent import ConversationAgent, AgentState, AGENT_MAX_TOKENS
+from agent_exceptions import AgentTruncationError
 from application_schema import ApplicationSchema, FIELD_ORDER, REQUIRED_FIELDS
+import conversation_agent
+
+
+# Schema shape, read once for every test that introspects it
+_FIELD_COUNT = len(FIELD_ORDER)
+_SCHEMA_FIELDS = tuple(fields(ApplicationSchema))
+
+_GOLDEN_PATH = Path(__file__).parent / 'golden_path_transcript.json'
+
+# conversation_agent's source and AST, parsed once at collection for the separation-of-concerns audits
+_CA_SOURCE = inspect.getsource(conversation_agent)
+_CA_AST = ast.parse(_CA_SOURCE, filename=conversation_agent.__file__)
+# Top-level packages the module imports anywhere (module level or inside functions)
+_CA_IMPORTS = frozenset(
+    name.split(".", 1)[0]
+    for node in ast.walk(_CA_AST)
+    if isinstance(node, (ast.Import, ast.ImportFrom))
+    for name in (
+        [alias.name for alias in node.names] if isinstance(node, ast.Import)
+        else [node.module or ""]
+    )
+)
+# (name, attribute) for every plain `name.attr` access, e.g. ("st", "error")
+_CA_ATTR_ACCESSES = frozenset(
+    (node.value.id, node.attr)
+    for node in ast.walk(_CA_AST)
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name)
+)
+
+# pytest.raises match patterns, compiled once
+_RE_MISSING_KEYS = re.compile(r"Agent response missing required keys")
+_RE_MULTI_Q = re.compile(r"Multiple questions detected")
+_RE_NO_SUMMARY = re.compile(r"Cannot advance without providing summary_for_user")
+_RE_INVALID_JSON = re.compile(r"Agent contract violation: Invalid JSON")
+_RE_REVIEW_INCOMPLETE = re.compile(r"Cannot enter review mode: data collection not complete")
+_RE_EDIT_OUTSIDE_REVIEW = re.compile(r"Cannot edit: not in review mode")
+_RE_TRUNCATED = re.compile(r"output limit")
+
+# Contract-breaking replies, serialised once; tests hand the strings straight to _resp
+_MISSING_KEY_JSON = orjson.dumps({
+    "acknowledgement": "Okay",
+    "extracted_data": {"company.legal_name": "Test Ltd"},
+    "summary_for_user": "Got it",
+    "next_question": "What's your CRO number?"
+    # Missing: "confidence"
+}).decode()
+_MULTI_Q_JSON = orjson.dumps({
+    "acknowledgement": "Okay",
+    "extracted_data": {"company.legal_name": "Test Ltd"},
+    "summary_for_user": "Got it",
+    "confidence": "high",
+    "next_question": "What's your CRO number? And when were you incorporated?"
+}).decode()
+_NO_SUMMARY_JSON = orjson.dumps({
+    "acknowledgement": "Okay",
+    "extracted_data": {"company.legal_name": "Test Ltd"},
+    "summary_for_user": "",  # Empty summary = no confirmation
+    "confidence": "high",
+    "next_question": "What's your CRO number?"
+}).decode()
+# A complete answer that happens to be short (three words)
+_SHORT_SKILLS_ANSWER = "Python, ML, cloud"
+_SHORT_SKILLS_JSON = orjson.dumps({
+    "acknowledgement": "Thanks",
+    "extracted_data": {"project.skills_required": _SHORT_SKILLS_ANSWER},
+    "summary_for_user": "You need expertise in Python, machine learning and cloud infrastructure.",
+    "confidence": "high",
+    "next_question": "Is that the full set of skills you need?"
+}).decode()
+
+
+def _resp(content, finish_reason="stop"):
+    """Completion-shaped response carrying content, a pre-serialised reply string, as-is"""
+    message = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason=finish_reason)])
+
+
+def stub_create(monkeypatch, agent, response):
+    """Make the agent's stand-in client return response (monkeypatch undoes it at teardown).
+    Returns the list of request kwargs, one entry per call, so tests can count retries"""
+    calls = []
+    monkeypatch.setattr(agent.client.chat.completions, "create",
+                        lambda **kwargs: calls.append(kwargs) or response)
+    return calls
+
+
+@pytest.fixture(scope="session")
+def golden_path_exists():
+    """One stat of the golden path transcript per test session"""
+    return _GOLDEN_PATH.is_file()
+
+
+@pytest.fixture
+def stateless_agent():
+    """Agent with only .state set (__init__ skipped) for tests that never reach the LLM"""
+    a = object.__new__(ConversationAgent)
+    a.state = AgentState()
+    yield a
+    # The client property would have cached itself here (or raised: no _api_key)
+    assert "client" not in vars(a), "State-only test touched the LLM client"
+
+
+@pytest.fixture
+def schema():
+    """Fresh, empty schema per test (constructing one is cheaper than deep-copying a template)"""
+    return ApplicationSchema()
+
+
+@pytest.fixture
+def agent():
+    """Fresh agent per test, on a stand-in client: no OpenAI client is built and no API key is needed"""
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=None)))
+    return ConversationAgent(client=client)
 
 
 class TestAgentContractEnforcement:
     """Test that agent contract violations cause hard errors"""
     
-    def test_missing_json_key_throws_error(self):
-        """
-        SAFEGUARD: Missing JSON keys must throw ValueError after retry.
-        Tests Rule 1: Agent JSON Response Contract
-        """
-        agent = ConversationAgent()
-        
-        # Mock OpenAI response with missing 'confidence' key
-        invalid_response = {
-            "acknowledgement": "Okay",
-            "extracted_data": {"company.legal_name": "Test Ltd"},
-            "summary_for_user": "Got it",
-            "next_question": "What's your CRO number?"
-            # Missing: "confidence"
-        }
-        
-        mock_choice = Mock()
-        mock_choice.message.content = json.dumps(invalid_response)
-        mock_response = Mock()
-        mock_response.choices = [mock_choice]
-        
-        with patch.object(agent.client.chat.completions, 'create', return_value=mock_response):
-            # Should throw ValueError after retry
-            with pytest.raises(ValueError, match="Agent response missing required keys"):
-                agent.process_input("Test Company Ltd")
-    
-    def test_multiple_questions_throws_error(self):
+    # attempts: API calls made before raising (2 = the one correction retry was used)
+    @pytest.mark.parametrize("payload, user_input, error, match, attempts", [
+        # Rule 1: missing JSON keys must throw ValueError after retry
+        pytest.param(
+            _MISSING_KEY_JSON, "Test Company Ltd", ValueError, _RE_MISSING_KEYS, 2,
+            id="missing_json_key_throws_error",
+        ),
+        # Rule 3: multiple questions in one turn must throw RuntimeError
+        pytest.param(
+            _MULTI_Q_JSON, "Test Company Ltd", RuntimeError, _RE_MULTI_Q, 1,
+            id="multiple_questions_throws_error",
+        ),
+        # Rule 4: extracted data without a summary must throw RuntimeError
+        pytest.param(
+            _NO_SUMMARY_JSON, "Test Company Ltd", RuntimeError, _RE_NO_SUMMARY, 1,
+            id="data_without_confirmation_throws_error",
+        ),
+        # Rule 1 + Rule 7: invalid JSON on both attempts must throw RuntimeError (fail loudly)
+        pytest.param(
+            "This is not JSON at all",
+            "Test input", RuntimeError, _RE_INVALID_JSON, 2,
+            id="invalid_json_throws_error_after_retry",
+        ),
+    ])
+    def test_response_contract_violations(self, agent, monkeypatch, payload, user_input, error, match, attempts):
         """
-        SAFEGUARD: Multiple questions in one turn must throw RuntimeError.
-        Tests Rule 3: Single-Question-Per-Turn Rule
+        SAFEGUARD: A reply that breaks the response contract must raise, never pass through.
+        Tests Rules 1, 3, 4 and 7 (one case per rule, see ids)
         """
-        agent = ConversationAgent()
-        
-        # Mock OpenAI response with multiple questions
-        multi_question_response = {
-            "acknowledgement": "Okay",
-            "extracted_data": {"company.legal_name": "Test Ltd"},
-            "summary_for_user": "Got it",
-            "confidence": "high",
-            "next_question": "What's your CRO number? And when were you incorporated?"
-        }
-        
-        mock_choice = Mock()
-        mock_choice.message.content = json.dumps(multi_question_response)
-        mock_response = Mock()
-        mock_response.choices = [mock_choice]
-        
-        with patch.object(agent.client.chat.completions, 'create', return_value=mock_response):
-            # Should throw RuntimeError on multiple questions
-            with pytest.raises(RuntimeError, match="Multiple questions detected"):
-                agent.process_input("Test Company Ltd")
+        calls = stub_create(monkeypatch, agent, _resp(payload))
+        with pytest.raises(error, match=match):
+            agent.process_input(user_input)
+        assert len(calls) == attempts
     
-    def test_data_without_confirmation_throws_error(self):
+    def test_truncated_reply_fails_without_retry(self, agent, monkeypatch):
         """
-        SAFEGUARD: Extracted data without summary must throw RuntimeError.
-        Tests Rule 4: Confirmation Before Advancement
+        SAFEGUARD: A reply cut off at max_tokens must raise its own error, not burn a retry.
+        Tests Rule 7: fail loudly (the same prompt would be cut off the same way)
         """
-        agent = ConversationAgent()
-        
-        # Mock OpenAI response with data but no summary
-        no_confirmation_response = {
-            "acknowledgement": "Okay",
-            "extracted_data": {"company.legal_name": "Test Ltd"},
-            "summary_for_user": "",  # Empty summary = no confirmation
-            "confidence": "high",
-            "next_question": "What's your CRO number?"
-        }
-        
-        mock_choice = Mock()
-        mock_choice.message.content = json.dumps(no_confirmation_response)
-        mock_response = Mock()
-        mock_response.choices = [mock_choice]
+        long_answer = "We will build a validated prototype for remote monitoring. " * 40
+        calls = stub_create(monkeypatch, agent, _resp(_NO_SUMMARY_JSON[:40], finish_reason="length"))
         
-        with patch.object(agent.client.chat.completions, 'create', return_value=mock_response):
-            # Should throw RuntimeError for missing confirmation
-            with pytest.raises(RuntimeError, match="Cannot advance without providing summary_for_user"):
-                agent.process_input("Test Company Ltd")
+        with pytest.raises(AgentTruncationError, match=_RE_TRUNCATED):
+            agent.process_input(long_answer)
+        assert len(calls) == 1
+        # The ceiling grows with the answer the reply has to restate
+        assert calls[0]["max_tokens"] > AGENT_MAX_TOKENS
     
-    def test_invalid_json_throws_error_after_retry(self):
+    def test_short_answer_to_required_project_field_is_accepted(self, agent, monkeypatch):
         """
-        SAFEGUARD: Invalid JSON must throw RuntimeError after one retry.
-        Tests Rule 1 + Rule 7: Fail loudly, no silent recovery
+        SAFEGUARD: A short but complete answer is never blocked by its length.
+        Tests Stage 2: only the model's confidence decides whether a project answer is weak
         """
-        agent = ConversationAgent()
+        field_index = FIELD_ORDER.index("project.skills_required")
+        agent.state.current_field_index = field_index
+        calls = stub_create(monkeypatch, agent, _resp(_SHORT_SKILLS_JSON))
         
-        # Mock OpenAI to return invalid JSON on both attempts
-        mock_choice = Mock()
-        mock_choice.message.content = "This is not JSON at all"
-        mock_response = Mock()
-        mock_response.choices = [mock_choice]
+        result = agent.process_input(_SHORT_SKILLS_ANSWER)
         
-        with patch.object(agent.client.chat.completions, 'create', return_value=mock_response):
-            # Should throw RuntimeError after retry fails
-            with pytest.raises(RuntimeError, match="Agent contract violation: Invalid JSON"):
-                agent.process_input("Test input")
+        # The answer reaches the model and comes back extracted, ready to confirm...
+        assert len(calls) == 1
+        assert result["extracted_data"] == {"project.skills_required": _SHORT_SKILLS_ANSWER}
+        assert result["summary_for_user"]
+        # ...with the model's confidence untouched, so it is applied like any other answer
+        assert result["confidence"] == "high"
+        assert agent.schema.get_field("project.skills_required") == _SHORT_SKILLS_ANSWER
+        assert agent.state.current_field_index == field_index + 1
     
-    def test_review_mode_required_before_completion(self):
+    def test_review_mode_required_before_completion(self, agent):
         """
         SAFEGUARD: System must enter review mode before marking complete.
         Tests Rule 5: Mandatory Review Mode
         """
-        agent = ConversationAgent()
-        
         # Simulate completing all fields
-        agent.state.current_field_index = len(FIELD_ORDER)
+        agent.state.current_field_index = _FIELD_COUNT
         
         # Attempting to enter review mode when complete should work
         agent.enter_review_mode()
@@ -130,32 +219,29 @@ class TestAgentContractEnforcement:
         agent2 = ConversationAgent()
         agent2.state.current_field_index = 5  # Not complete
         
-        with pytest.raises(RuntimeError, match="Cannot enter review mode: data collection not complete"):
+        with pytest.raises(RuntimeError, match=_RE_REVIEW_INCOMPLETE):
             agent2.enter_review_mode()
     
-    def test_edit_outside_review_mode_throws_error(self):
+    def test_edit_outside_review_mode_throws_error(self, agent):
         """
         SAFEGUARD: Field edits only allowed in review mode.
         Tests Rule 5: Review mode enforcement
         """
-        agent = ConversationAgent()
         agent.state.in_review_mode = False
         
         # Attempting to edit without review mode should fail
-        with pytest.raises(RuntimeError, match="Cannot edit: not in review mode"):
+        with pytest.raises(RuntimeError, match=_RE_EDIT_OUTSIDE_REVIEW):
             agent.edit_field_in_review("company.legal_name", "New Value")
 
 
 class TestSchemaLockEnforcement:
     """Test that schema violations are caught"""
     
-    def test_invalid_field_path_rejected(self):
+    def test_invalid_field_path_rejected(self, schema):
         """
         SAFEGUARD: Unknown field paths must be rejected.
         Tests Rule 2: Canonical Schema Lock
         """
-        schema = ApplicationSchema()
-        
         # Valid field should work
         assert schema.set_field("company.legal_name", "Test Ltd") is True
         
@@ -163,13 +249,23 @@ class TestSchemaLockEnforcement:
         assert schema.set_field("company.invented_field", "Bad Data") is False
         assert schema.set_field("random.path.here", "Bad Data") is False
     
-    def test_no_free_text_blobs_in_schema(self):
+    def test_overwritten_parent_reads_as_missing(self, schema):
+        """
+        SAFEGUARD: A sub-object replaced by a plain value must not crash field access.
+        Tests Rule 2: Canonical Schema Lock (missing means None/False, never an exception)
+        """
+        # A plausible model extraction: the whole address as one string
+        assert schema.set_field("company.registered_address", "1 Main St, Cork") is True
+        
+        assert schema.get_field("company.registered_address.city") is None
+        assert schema.set_field("company.registered_address.city", "Cork") is False
+        assert schema.update_fields({"company.registered_address.city": "Cork"}) is False
+    
+    def test_no_free_text_blobs_in_schema(self, schema):
         """
         SAFEGUARD: Schema must not accept unstructured data.
         Tests Rule 2: No free-text blobs
         """
-        schema = ApplicationSchema()
-        
         # All fields must have defined types
         # Attempting to set a complex object on a string field should fail type checking
         result = schema.set_field("company.legal_name", {"unexpected": "object"})
@@ -179,53 +275,66 @@ class TestSchemaLockEnforcement:
         assert isinstance(schema.company.legal_name, (str, dict))  # Will store it
         
         # Better enforcement: Check all schema fields are typed correctly
-        from dataclasses import fields
-        for field in fields(ApplicationSchema):
+        for field in _SCHEMA_FIELDS:
             assert hasattr(field.type, '__dataclass_fields__') or field.type in [str, int, list, dict, type(None)]
 
 
 class TestStateIsolation:
     """Test that state is never inferred from history"""
     
-    def test_state_independent_of_history(self):
+    def test_state_independent_of_history(self, stateless_agent):
         """
         SAFEGUARD: Agent state must be explicit, never inferred.
         Tests Rule 6: State Tracking
         """
-        agent = ConversationAgent()
-        
         # Add items to conversation history
-        agent.state.conversation_history.append({
-            "user": "My company is Test Ltd",
-            "agent": "Got it, Test Ltd."
-        })
-        agent.state.conversation_history.append({
-            "user": "CRO is 12345",
-            "agent": "Noted."
-        })
+        stateless_agent.state.record_exchange("My company is Test Ltd", "Got it, Test Ltd.")
+        stateless_agent.state.record_exchange("CRO is 12345", "Noted.")
+        assert len(list(stateless_agent.state.history_pairs())) == 2
         
         # State should NOT be affected by history
-        assert agent.state.current_field_index == 0
-        assert len(agent.state.completed_fields) == 0
+        assert stateless_agent.state.current_field_index == 0
+        assert len(stateless_agent.state.completed_fields) == 0
         
         # State only changes through explicit state methods
-        agent.state.advance()
-        assert agent.state.current_field_index == 1
-        assert len(agent.state.completed_fields) == 1
+        stateless_agent.state.advance()
+        assert stateless_agent.state.current_field_index == 1
+        assert len(stateless_agent.state.completed_fields) == 1
     
-    def test_state_tracks_confidence_explicitly(self):
+    def test_reanswered_field_is_recorded_once(self, stateless_agent):
+        """
+        SAFEGUARD: Completed/skipped lists and their set mirrors must never disagree.
+        Tests Rule 6: State Tracking (pages re-point current_field_index when revisited)
+        """
+        state = stateless_agent.state
+        title_index = FIELD_ORDER.index("project.title")
+        for _ in range(2):
+            state.current_field_index = title_index
+            state.advance()
+        assert state.completed_fields == ["project.title"]
+        
+        state.go_back()
+        assert state.completed_fields == []
+        assert state.completed_set == set()
+        
+        uncertainty_index = FIELD_ORDER.index("project.technical_uncertainty")
+        for _ in range(2):
+            state.current_field_index = uncertainty_index
+            assert state.skip_current() is True
+        assert state.skipped_fields == ["project.technical_uncertainty"]
+        assert state.skipped_set == {"project.technical_uncertainty"}
+    
+    def test_state_tracks_confidence_explicitly(self, stateless_agent):
         """
         SAFEGUARD: Confidence must be tracked in state, not inferred.
         Tests Rule 6: Explicit state tracking
         """
-        agent = ConversationAgent()
-        
         # Initially empty
-        assert len(agent.state.confidence_flags) == 0
+        assert len(stateless_agent.state.confidence_flags) == 0
         
         # Must be set explicitly
-        agent.state.confidence_flags["company.legal_name"] = "high"
-        assert agent.state.confidence_flags["company.legal_name"] == "high"
+        stateless_agent.state.confidence_flags["company.legal_name"] = "high"
+        assert stateless_agent.state.confidence_flags["company.legal_name"] == "high"
         
         # Cannot be inferred from anything else
 
@@ -238,33 +347,27 @@ class TestSeparationOfConcerns:
         SAFEGUARD: Agent must not import UI frameworks.
         Tests Rule 8: Separation of Concerns
         """
-        import conversation_agent
-        import inspect
-        
-        # Get all imports in conversation_agent module
-        source = inspect.getsource(conversation_agent)
-        
-        # Agent should not import Streamlit (UI concern)
+        # Agent should not import Streamlit (UI concern), in any form: import streamlit,
+        # import streamlit as st, from streamlit import ..., or inside a function.
+        # Comments and strings mentioning streamlit don't count (real imports only).
         # Note: This will fail if we add st.error() etc. Must use raise instead.
-        assert 'import streamlit' not in source or 'streamlit as st' in source
-        # We allow st for error display but agent logic must not depend on it
+        assert 'streamlit' not in _CA_IMPORTS
+        # ...nor call UI helpers through a module handed in some other way (st.error, st.write, ...)
+        assert not {attr for name, attr in _CA_ATTR_ACCESSES if name in ('st', 'streamlit')}
 
 
 # Regression baseline marker
 class TestGoldenPathMarker:
     """Marker for golden path transcript location"""
     
-    def test_golden_path_exists(self):
+    def test_golden_path_exists(self, golden_path_exists):
         """
         SAFEGUARD: Golden path transcript must exist.
         Tests: Regression baseline requirement
         """
-        import os
-        golden_path = os.path.join(os.path.dirname(__file__), 'golden_path_transcript.json')
-        
         # This test will fail until golden path is created
         # That's intentional - forces creation of baseline
-        assert os.path.exists(golden_path), "Golden path transcript missing. Create tests/golden_path_transcript.json"
+        assert golden_path_exists, "Golden path transcript missing. Create tests/golden_path_transcript.json"
 
 
 if __name__ == "__main__":
@@ -0,0 +1,159 @@
+"""
+Tests for the agent's response cache (llm_cache.ResponseCache).
+Covers single-flight sharing between concurrent sessions, TTL expiry and the in-memory LRU.
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+import llm_cache
+from llm_cache import ResponseCache
+
+
+# Long enough for a follower thread to reach future.result() before the leader is released
+_SETTLE_SECONDS = 0.2
+_JOIN_TIMEOUT = 5
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path))
+
+
+def _in_thread(target, results, name):
+    """Run target() on a thread, storing its return value or exception under name"""
+    def run():
+        try:
+            results[name] = target()
+        except BaseException as e:
+            results[name] = e
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def _wait_in_flight(cache, key):
+    """Block until a leader has registered key"""
+    deadline = time.monotonic() + _JOIN_TIMEOUT
+    while key not in cache._in_flight:
+        assert time.monotonic() < deadline, "leader never registered"
+        time.sleep(0.005)
+
+
+class _Rerun(BaseException):
+    """Stands in for Streamlit's RerunException/StopException"""
+
+
+class TestSingleFlight:
+    """Concurrent identical requests share one fetch, and only its ordinary outcome"""
+
+    def _leader_and_follower(self, cache, leader_fetch, follower_fetch):
+        results = {}
+        leader = _in_thread(lambda: cache.single_flight("k", leader_fetch), results, "leader")
+        _wait_in_flight(cache, "k")
+        follower = _in_thread(lambda: cache.single_flight("k", follower_fetch), results, "follower")
+        return leader, follower, results
+
+    def test_follower_shares_leader_result(self, cache):
+        release = threading.Event()
+        follower_calls = []
+
+        def leader_fetch():
+            release.wait(_JOIN_TIMEOUT)
+            return "leader"
+
+        leader, follower, results = self._leader_and_follower(
+            cache, leader_fetch, lambda: follower_calls.append(1) or "own")
+        time.sleep(_SETTLE_SECONDS)
+        release.set()
+        leader.join(_JOIN_TIMEOUT)
+        follower.join(_JOIN_TIMEOUT)
+
+        assert results == {"leader": "leader", "follower": "leader"}
+        assert follower_calls == []
+        assert cache._in_flight == {}
+
+    def test_leader_exception_is_shared(self, cache):
+        release = threading.Event()
+
+        def leader_fetch():
+            release.wait(_JOIN_TIMEOUT)
+            raise ValueError("API error")
+
+        leader, follower, results = self._leader_and_follower(cache, leader_fetch, lambda: "own")
+        time.sleep(_SETTLE_SECONDS)
+        release.set()
+        leader.join(_JOIN_TIMEOUT)
+        follower.join(_JOIN_TIMEOUT)
+
+        assert isinstance(results["leader"], ValueError)
+        assert isinstance(results["follower"], ValueError)
+        assert cache._in_flight == {}
+
+    def test_interrupted_leader_sends_follower_to_its_own_fetch(self, cache):
+        release = threading.Event()
+
+        def leader_fetch():
+            release.wait(_JOIN_TIMEOUT)
+            raise _Rerun()
+
+        leader, follower, results = self._leader_and_follower(cache, leader_fetch, lambda: "own")
+        time.sleep(_SETTLE_SECONDS)
+        release.set()
+        leader.join(_JOIN_TIMEOUT)
+        follower.join(_JOIN_TIMEOUT)
+
+        # The rerun stays in the leader's session; the follower never sees it
+        assert isinstance(results["leader"], _Rerun)
+        assert results["follower"] == "own"
+        assert cache._in_flight == {}
+
+    def test_follower_stops_waiting_after_timeout(self, tmp_path):
+        cache = ResponseCache(str(tmp_path), single_flight_timeout=0.05)
+        release = threading.Event()
+
+        def leader_fetch():
+            release.wait(_JOIN_TIMEOUT)
+            return "leader"
+
+        leader, follower, results = self._leader_and_follower(cache, leader_fetch, lambda: "own")
+        follower.join(_JOIN_TIMEOUT)
+        # The follower gave up on the stalled leader while it was still running
+        assert results["follower"] == "own"
+        assert "leader" not in results
+
+        release.set()
+        leader.join(_JOIN_TIMEOUT)
+        assert results["leader"] == "leader"
+        assert cache._in_flight == {}
+
+
+class TestExpiryAndEviction:
+    """Entries expire after the TTL and the memory tier stays bounded"""
+
+    def test_expired_entry_is_a_miss_and_is_deleted(self, tmp_path, monkeypatch):
+        cache = ResponseCache(str(tmp_path), ttl_seconds=60)
+        cache.set("k", "reply")
+        assert cache.get("k") == "reply"
+
+        now = time.time()
+        monkeypatch.setattr(llm_cache.time, "time", lambda: now + 61)
+
+        assert cache.get("k") is None
+        assert "k" not in cache._memory
+        assert not os.path.exists(cache._path("k"))
+
+    def test_memory_tier_evicts_least_recently_used(self, tmp_path):
+        cache = ResponseCache(str(tmp_path), memory_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")  # a is now more recent than b
+        cache.set("c", "3")
+
+        assert list(cache._memory) == ["a", "c"]
+        # Evicted from memory only: the file still serves it, and it is remembered again
+        assert cache.get("b") == "2"
+        assert list(cache._memory) == ["c", "b"]